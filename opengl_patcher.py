@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
+import argparse
+import functools
 import os
+import plistlib
+import shlex
 import shutil
+import stat
 import sys
 import subprocess
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Shared by every backup made in one run, so they can be restored together
+RUN_TIMESTAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
 
 # Configurable app list: {path: {name, flags, executable, method}}
 # method: "patch" (in-bundle wrapper) or "script" (external script + wrapper app)
@@ -52,199 +61,447 @@ APPS_TO_PATCH = {
     }
 }
 
+# APPS_TO_PATCH with the values each patcher needs resolved once at load:
+# executable_path, orig_path (backup of the real executable), script_name,
+# flag_str (for printing), flag_quoted (shell-quoted, for exec) and
+# log_message (shell-quoted, for the launch log)
+APPS_RESOLVED = {
+    app_path: {
+        **app_info,
+        "executable_path": os.path.join(app_path, app_info["executable"]),
+        "orig_path": os.path.join(app_path, app_info["executable"]) + ".orig",
+        "script_name": app_info["name"].lower().replace(' ', '_') + "_opengl.sh",
+        "flag_str": " ".join(app_info["flags"]),
+        "flag_quoted": " ".join(shlex.quote(flag) for flag in app_info["flags"]),
+        "log_message": shlex.quote(
+            f"Launching {app_info['name']} with flags: {' '.join(app_info['flags'])}"),
+    }
+    for app_path, app_info in APPS_TO_PATCH.items()
+}
+
 INSTALL_DIR = "/usr/local/bin"
 WRAPPER_DIR = os.path.expanduser("~/Applications")
 
+# Launch script used both as the in-bundle wrapper and the external script.
+# Every substituted value except {name} (a comment) must be shell-quoted:
+# log_file is the quoted log file name and target the real executable to exec
+WRAPPER_TMPL = (
+    "#!/bin/bash\n"
+    "# Launch {name} with OpenGL flags\n"
+    "printf '%s: %s\\n' \"$(date)\" {log_message} >> \"$HOME/Library/Logs/\"{log_file}\n"
+    'exec {target} {flag_quoted} "$@"\n'
+)
+
+# Returned by the patch functions when the app is already set up as configured
+UNCHANGED = "unchanged"
+
+# Mach-O and universal binary magic numbers, in both byte orders
+MACHO_MAGICS = {
+    b"\xfe\xed\xfa\xce", b"\xce\xfa\xed\xfe",  # 32-bit
+    b"\xfe\xed\xfa\xcf", b"\xcf\xfa\xed\xfe",  # 64-bit
+    b"\xca\xfe\xba\xbe", b"\xbe\xba\xfe\xca",  # universal
+}
+
+@functools.lru_cache(maxsize=256)
+def _exists(path):
+    """Cached os.path.exists; call _exists.cache_clear() after renaming files."""
+    return os.path.exists(path)
+
+def _same_content(path, data, mode):
+    """Return True if the file at path already holds exactly data with mode.
+
+    The size is compared first so a large binary (e.g. an app executable that
+    an update put back in place) is never read just to find it differs.
+    """
+    try:
+        st = os.stat(path)
+        if st.st_size != len(data) or stat.S_IMODE(st.st_mode) != mode:
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def _write_file(path, data, mode):
+    """Write all of data to path and set its mode, whatever the umask or prior mode."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        os.fchmod(fd, mode)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def clone_file(src, dst):
+    """Copy a file as an APFS clone, falling back to a regular copy."""
+    try:
+        subprocess.run(["cp", "-c", src, dst], check=True, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        shutil.copy(src, dst)
+
 def backup_file(file_path):
     """Create a timestamped backup of the original file."""
-    if not os.path.exists(file_path):
+    if not _exists(file_path):
         print(f"Error: {file_path} not found.")
         return False
     backup_dir = os.path.dirname(file_path) + "/Backups"
     os.makedirs(backup_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{backup_dir}/{os.path.basename(file_path)}.backup_{timestamp}"
-    shutil.copy(file_path, backup_path)
+    backup_path = f"{backup_dir}/{os.path.basename(file_path)}.backup_{RUN_TIMESTAMP}"
+    clone_file(file_path, backup_path)
     print(f"Backup created: {backup_path}")
     return True
 
-def resign_app(app_path, app_name):
-    """Deep resign the app and remove quarantine attribute."""
+def codesign_command(full_resign=False):
+    """Build the ad-hoc codesign command, without the paths to sign.
+
+    Only the main executable of a patched app changes, so by default just the
+    top-level bundle is resigned and nested helpers keep their signatures.
+    full_resign adds --deep for bundles whose nested signatures are broken.
+    """
+    # SecCodeSigner is private Security.framework API that PyObjC does not
+    # expose, so signing goes through the codesign tool, batched in one call.
+    command = ["codesign", "--timestamp=none", "-f", "-s", "-"]
+    if full_resign:
+        command.insert(1, "--deep")
+    return command
+
+def resign_one(app_path, app_name, full_resign=False):
+    """Resign a single app."""
     print(f"Resigning {app_name} at {app_path}...")
     try:
-        subprocess.run(["codesign", "--deep", "-f", "-s", "-", app_path], check=True)
+        subprocess.run([*codesign_command(full_resign), app_path],
+                       check=True, capture_output=True, text=True)
         print(f"Successfully resigned {app_name}.")
     except subprocess.CalledProcessError as e:
         print(f"Failed to resign {app_name}: {e}")
+        if e.stderr:
+            print(e.stderr.strip())
         return False
+    return True
+
+def resign_apps(patched, full_resign=False):
+    """Resign all patched apps in one codesign call.
 
-    print(f"Removing quarantine attribute for {app_name}...")
+    patched maps each app path to (app name, patched executable path, .orig
+    path). If the batched call fails, apps are resigned one by one so the
+    original executable of any app that still fails can be restored. Returns
+    the resigned app paths.
+
+    The batched call runs silently; the per-app fallback captures and prints
+    codesign's diagnostics for the app that fails.
+    """
+    app_paths = list(patched)
+    print(f"Resigning {len(app_paths)} app(s)...")
     try:
-        subprocess.run(["xattr", "-r", "-d", "com.apple.quarantine", app_path], check=True)
-        print(f"Quarantine attribute removed for {app_name}.")
+        subprocess.run([*codesign_command(full_resign), *app_paths], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print("Successfully resigned all patched apps.")
+        resigned = app_paths
     except subprocess.CalledProcessError as e:
-        print(f"Failed to remove quarantine attribute: {e}")
-    return True
+        print(f"Batched resign failed, resigning apps individually: {e}")
+        resigned = []
+        for app_path, (app_name, executable_path, orig_path) in patched.items():
+            if resign_one(app_path, app_name, full_resign):
+                resigned.append(app_path)
+            else:
+                print(f"Restoring original executable for {app_name} due to signing failure...")
+                os.replace(orig_path, executable_path)
+                _exists.cache_clear()
+    return resigned
+
+def remove_quarantine_batch(paths):
+    """Remove the quarantine attribute from all given apps in one xattr call."""
+    print("Removing quarantine attribute from resigned apps...")
+    # xattr exits nonzero when an app has no quarantine attribute, which is fine
+    subprocess.run(["xattr", "-r", "-d", "com.apple.quarantine", *paths],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def already_patched(app_info):
+    """Return True if the app's executable is one of our wrapper scripts.
+
+    A .orig next to an executable that starts with a shebang means a previous
+    run patched it; checking two bytes avoids reading or verifying the bundle.
+    """
+    if not _exists(app_info["orig_path"]):
+        return False
+    try:
+        with open(app_info["executable_path"], "rb") as f:
+            return f.read(2) == b"#!"
+    except OSError:
+        return False
+
+def is_macho(path):
+    """Return True if the file at path starts with a Mach-O magic number."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) in MACHO_MAGICS
+    except OSError:
+        return False
 
 def patch_in_bundle(app_path, app_info):
-    """Patch the app by replacing its executable with a wrapper script."""
+    """Patch the app by replacing its executable with a wrapper script.
+
+    Returns the patched executable path (the app still needs resigning),
+    UNCHANGED if the existing wrapper is already up to date, or None on failure.
+    """
     app_name = app_info["name"]
-    flags = app_info["flags"]
-    executable_path = f"{app_path}/{app_info['executable']}"
-    print(f"Patching {app_name} in-bundle at {executable_path} with flags: {' '.join(flags)}...")
+    executable_path = app_info["executable_path"]
+    print(f"Patching {app_name} in-bundle at {executable_path} with flags: {app_info['flag_str']}...")
 
-    if not os.path.exists(executable_path):
+    if not _exists(executable_path):
         print(f"Skipping {app_name}: Executable not found.")
-        return False
+        return None
 
-    original_executable = f"{executable_path}.orig"
-    if not os.path.exists(original_executable):
-        if not backup_file(executable_path):
-            return False
-        shutil.move(executable_path, original_executable)
-    else:
+    original_executable = app_info["orig_path"]
+    wrapper_script = WRAPPER_TMPL.format(
+        name=app_name, log_message=app_info["log_message"],
+        log_file=shlex.quote(f"{app_name}_wrapper.log"),
+        target=shlex.quote(original_executable), flag_quoted=app_info["flag_quoted"])
+    if already_patched(app_info):
+        # The existing signature is still valid if the wrapper is unchanged
+        if _same_content(executable_path, wrapper_script.encode(), 0o755):
+            print(f"Wrapper script for {app_name} is already up to date.")
+            return UNCHANGED
         print(f"Original executable already backed up at {original_executable}.")
+    elif _exists(original_executable) and not is_macho(executable_path):
+        # Not a wrapper and not a binary: an earlier write was cut short, so
+        # .orig still holds the real executable and only the wrapper is redone
+        print(f"Repairing incomplete wrapper for {app_name}, keeping {original_executable}.")
+    else:
+        if _exists(original_executable):
+            # An app update put a real binary back; the old .orig is stale
+            print(f"{app_name} was updated since it was last patched. Replacing {original_executable}.")
+        if not backup_file(executable_path):
+            return None
+        os.replace(executable_path, original_executable)
+        _exists.cache_clear()
 
-    wrapper_script = f"""#!/bin/bash
-# Launch {app_name} with OpenGL flags
-echo "$(date): Launching {app_name} with flags: {' '.join(flags)}" >> ~/Library/Logs/{app_name}_wrapper.log
-exec "{original_executable}" {' '.join(f'"{flag}"' for flag in flags)} "$@"
-"""
     try:
-        with open(executable_path, "w") as f:
-            f.write(wrapper_script)
-        os.chmod(executable_path, 0o755)
+        _write_file(executable_path, wrapper_script.encode(), 0o755)
         print(f"Wrapper script created for {app_name}.")
-    except PermissionError:
-        print(f"Permission denied. Please run with sudo: 'sudo python3 {sys.argv[0]}'")
-        sys.exit(1)
     except Exception as e:
         print(f"Error writing wrapper for {app_name}: {e}")
-        return False
-
-    if not resign_app(app_path, app_name):
-        print(f"Restoring original executable for {app_name} due to signing failure...")
-        shutil.move(original_executable, executable_path)
-        return False
-    return True
+        # Don't leave the bundle without a working main executable
+        print(f"Restoring original executable for {app_name}...")
+        os.replace(original_executable, executable_path)
+        _exists.cache_clear()
+        return None
+    return executable_path
 
 def create_script_and_wrapper(app_path, app_info):
-    """Create an external launch script and wrapper app."""
+    """Create an external launch script and wrapper app.
+
+    Files that already hold the expected content are left untouched. Returns
+    the wrapper app path (to register with Launch Services) on success,
+    UNCHANGED if the script and wrapper app are already up to date, or None
+    on failure.
+    """
     app_name = app_info["name"]
-    flags = app_info["flags"]
-    executable_path = f"{app_path}/{app_info['executable']}"
-    script_name = f"{app_name.lower().replace(' ', '_')}_opengl.sh"
-    script_path = f"{INSTALL_DIR}/{script_name}"
+    executable_path = app_info["executable_path"]
+    script_path = f"{INSTALL_DIR}/{app_info['script_name']}"
     wrapper_app_path = f"{WRAPPER_DIR}/{app_name} OpenGL.app"
 
-    if not os.path.exists(executable_path):
+    if not _exists(executable_path):
         print(f"Skipping {app_name}: Executable not found.")
-        return False
+        return None
+
+    script_content = WRAPPER_TMPL.format(
+        name=app_name, log_message=app_info["log_message"],
+        log_file=shlex.quote(f"{app_name}_launch.log"),
+        target=shlex.quote(executable_path), flag_quoted=app_info["flag_quoted"])
+    wrapper_script = f"""#!/bin/bash
+{script_path}
+"""
+    wrapper_executable = f"{wrapper_app_path}/Contents/MacOS/{app_name} OpenGL"
+    plist = {
+        "CFBundleExecutable": f"{app_name} OpenGL",
+        "CFBundleIdentifier": f"com.{app_name.lower().replace(' ', '.')}.opengl",
+        "CFBundleName": f"{app_name} OpenGL",
+        "CFBundleVersion": "1.0",
+        "CFBundlePackageType": "APPL",
+    }
+    plist_data = plistlib.dumps(plist, fmt=plistlib.FMT_BINARY)
+    plist_path = f"{wrapper_app_path}/Contents/Info.plist"
 
     # Revert any prior in-bundle patch
-    original_executable = f"{executable_path}.orig"
-    if os.path.exists(original_executable):
+    original_executable = app_info["orig_path"]
+    reverted = _exists(original_executable)
+    if reverted:
         print(f"Reverting prior patch for {app_name}...")
-        shutil.move(original_executable, executable_path)
+        os.replace(original_executable, executable_path)
+        _exists.cache_clear()
+
+    script_current = _same_content(script_path, script_content.encode(), 0o755)
+    wrapper_current = _same_content(wrapper_executable, wrapper_script.encode(), 0o755)
+    plist_current = _same_content(plist_path, plist_data, 0o644)
+    if not reverted and script_current and wrapper_current and plist_current:
+        print(f"Launch script and wrapper app for {app_name} are already up to date.")
+        return UNCHANGED
 
     # Create the launch script
-    script_content = f"""#!/bin/bash
-# Launch {app_name} with OpenGL flags
-echo "$(date): Launching {app_name} with flags: {' '.join(flags)}" >> ~/Library/Logs/{app_name}_launch.log
-exec "{executable_path}" {' '.join(f'"{flag}"' for flag in flags)} "$@"
-"""
-    print(f"Creating launch script for {app_name} at {script_path}...")
-    try:
-        with open(script_path, "w") as f:
-            f.write(script_content)
-        os.chmod(script_path, 0o755)
-        print(f"Launch script created for {app_name}.")
-    except PermissionError:
-        print(f"Permission denied. Please run with sudo: 'sudo python3 {sys.argv[0]}'")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error creating launch script for {app_name}: {e}")
-        return False
+    if not script_current:
+        print(f"Creating launch script for {app_name} at {script_path}...")
+        try:
+            _write_file(script_path, script_content.encode(), 0o755)
+            print(f"Launch script created for {app_name}.")
+        except Exception as e:
+            print(f"Error creating launch script for {app_name}: {e}")
+            return None
 
     # Create the wrapper app
     os.makedirs(f"{wrapper_app_path}/Contents/MacOS", exist_ok=True)
     os.makedirs(f"{wrapper_app_path}/Contents/Resources", exist_ok=True)
 
-    wrapper_script = f"""#!/bin/bash
-{script_path}
-"""
-    wrapper_executable = f"{wrapper_app_path}/Contents/MacOS/{app_name} OpenGL"
-    try:
-        with open(wrapper_executable, "w") as f:
-            f.write(wrapper_script)
-        os.chmod(wrapper_executable, 0o755)
-    except Exception as e:
-        print(f"Error creating wrapper executable for {app_name}: {e}")
-        return False
+    if not wrapper_current:
+        try:
+            _write_file(wrapper_executable, wrapper_script.encode(), 0o755)
+        except Exception as e:
+            print(f"Error creating wrapper executable for {app_name}: {e}")
+            return None
 
-    plist_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-<dict>
-    <key>CFBundleExecutable</key>
-    <string>{app_name} OpenGL</string>
-    <key>CFBundleIdentifier</key>
-    <string>com.{app_name.lower().replace(' ', '.')}.opengl</string>
-    <key>CFBundleName</key>
-    <string>{app_name} OpenGL</string>
-    <key>CFBundleVersion</key>
-    <string>1.0</string>
-    <key>CFBundlePackageType</key>
-    <string>APPL</string>
-</dict>
-</plist>
-"""
-    with open(f"{wrapper_app_path}/Contents/Info.plist", "w") as f:
-        f.write(plist_content)
+    if not plist_current:
+        _write_file(plist_path, plist_data, 0o644)
 
     # Copy icon (optional)
     icon_path = f"{app_path}/Contents/Resources/{app_name}.icns"
-    if os.path.exists(icon_path):
-        shutil.copy(icon_path, f"{wrapper_app_path}/Contents/Resources/")
+    if _exists(icon_path):
+        clone_file(icon_path, f"{wrapper_app_path}/Contents/Resources/")
     print(f"Created wrapper app for {app_name} at {wrapper_app_path}.")
-    return True
+    return wrapper_app_path
+
+def register_wrapper_apps(wrapper_paths):
+    """Register new wrapper apps with Launch Services so Dock/Finder see them.
 
-def reset_launch_services():
-    """Reset the Launch Services database to refresh Dock/Finder."""
-    print("Resetting Launch Services database...")
+    Only the given bundles are registered, rather than rescanning every domain.
+    """
+    print("Registering wrapper apps with Launch Services...")
+    command = [
+        "/System/Library/Frameworks/CoreServices.framework/Versions/A/Frameworks/LaunchServices.framework/Versions/A/Support/lsregister",
+        "-f", *wrapper_paths
+    ]
     try:
-        subprocess.run([
-            "/System/Library/Frameworks/CoreServices.framework/Versions/A/Frameworks/LaunchServices.framework/Versions/A/Support/lsregister",
-            "-kill", "-r", "-domain", "local", "-domain", "system", "-domain", "user"
-        ], check=True)
-        print("Launch Services reset complete. Restarting Dock...")
-        subprocess.run(["killall", "Dock"], check=True)
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print("Launch Services registration complete.")
     except subprocess.CalledProcessError as e:
-        print(f"Failed to reset Launch Services: {e}")
+        print(f"Failed to register wrapper apps: {e}")
+        # Re-run with output captured to show why
+        diagnostic = subprocess.run(command, capture_output=True, text=True)
+        if diagnostic.stderr:
+            print(diagnostic.stderr.strip())
+
+def unwritable_paths():
+    """Return the directories this run needs to write to but cannot.
+
+    Covers INSTALL_DIR, WRAPPER_DIR and the executable directory of each
+    installed app; apps that are not installed are skipped later anyway.
+    """
+    paths = [INSTALL_DIR, WRAPPER_DIR]
+    for app_info in APPS_RESOLVED.values():
+        executable_dir = os.path.dirname(app_info["executable_path"])
+        if _exists(executable_dir):
+            paths.append(executable_dir)
+    return [path for path in paths if not os.access(path, os.W_OK)]
+
+def finish_apps(results, full_resign=False):
+    """Resign patched apps and register wrapper apps from _process_app results.
+
+    results maps app paths to _process_app results; apps without an entry are
+    skipped, so this can run on a partial set after an error.
+    """
+    patched = {}  # app path -> (name, executable, .orig), for rollback if signing fails
+    wrappers = []  # wrapper apps to register with Launch Services
+    for app_path, app_info in APPS_RESOLVED.items():
+        result = results.get(app_path)
+        if not result or result == UNCHANGED:
+            continue
+        if app_info.get("method", "patch") == "patch":
+            patched[app_path] = (app_info["name"], result, app_info["orig_path"])
+        else:
+            wrappers.append(result)
+
+    if patched:
+        resigned = resign_apps(patched, full_resign)
+        if resigned:
+            remove_quarantine_batch(resigned)
+        for app_path, (app_name, _, _) in patched.items():
+            if app_path in resigned:
+                print(f"{app_name} patched successfully (in-bundle). Launch normally.")
+            else:
+                print(f"Fallback: Could not patch {app_name} in-bundle.")
+
+    if wrappers:
+        register_wrapper_apps(wrappers)
+
+def _process_app(app_path, app_info):
+    """Patch one app according to its method. Runs in a worker thread.
+
+    Returns the result of the patch function: a truthy value if the app was
+    changed, UNCHANGED if it was already set up, or None on failure.
+    For 'patch' apps the truthy value is the executable path to resign, for
+    'script' apps it is the wrapper app path to register.
+    """
+    method = app_info.get("method", "patch")  # Default to patch if unspecified
+    if method == "patch":
+        result = patch_in_bundle(app_path, app_info)
+        if result == UNCHANGED:
+            print(f"{app_info['name']} is already patched (in-bundle). Launch normally.")
+        elif not result:
+            print(f"Fallback: Could not patch {app_info['name']} in-bundle.")
+        return result
+    elif method == "script":
+        result = create_script_and_wrapper(app_path, app_info)
+        if result == UNCHANGED:
+            print(f"{app_info['name']} is already set up (external script). Use '~/Applications/{app_info['name']} OpenGL.app'.")
+        elif result:
+            print(f"{app_info['name']} set up successfully (external script). Use '~/Applications/{app_info['name']} OpenGL.app'.")
+        else:
+            print(f"Failed to set up {app_info['name']} with external script.")
+        return result
+    return None
 
 def main():
+    parser = argparse.ArgumentParser(description="Patch Electron apps to launch with OpenGL rendering.")
+    parser.add_argument("--full-resign", action="store_true",
+                        help="resign patched apps with codesign --deep, including all nested code")
+    args = parser.parse_args()
+
+    # Fail before any backup or move rather than partway through patching
+    if os.geteuid() != 0:
+        print(f"This script must be run as root. Re-run with: sudo python3 {sys.argv[0]}")
+        sys.exit(1)
+
     print("Patching applications for OpenGL rendering (hybrid method)...")
     if not os.path.exists(INSTALL_DIR):
         os.makedirs(INSTALL_DIR, exist_ok=True)
     if not os.path.exists(WRAPPER_DIR):
         os.makedirs(WRAPPER_DIR, exist_ok=True)
 
-    for app_path, app_info in APPS_TO_PATCH.items():
-        method = app_info.get("method", "patch")  # Default to patch if unspecified
-        if method == "patch":
-            success = patch_in_bundle(app_path, app_info)
-            if success:
-                print(f"{app_info['name']} patched successfully (in-bundle). Launch normally.")
-            else:
-                print(f"Fallback: Could not patch {app_info['name']} in-bundle.")
-        elif method == "script":
-            success = create_script_and_wrapper(app_path, app_info)
-            if success:
-                print(f"{app_info['name']} set up successfully (external script). Use '~/Applications/{app_info['name']} OpenGL.app'.")
-            else:
-                print(f"Failed to set up {app_info['name']} with external script.")
+    unwritable = unwritable_paths()
+    if unwritable:
+        for path in unwritable:
+            print(f"Permission denied: cannot write to {path}")
+        sys.exit(1)
 
-    reset_launch_services()
+    # Per-app work is file I/O and subprocesses, so threads overlap it fine;
+    # results are only collected here, so workers share no mutable state
+    futures = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(APPS_RESOLVED))) as executor:
+            futures = {executor.submit(_process_app, app_path, app_info): app_path
+                       for app_path, app_info in APPS_RESOLVED.items()}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    # Skipped by finish_apps; the other apps still get signed
+                    print(f"Error patching {APPS_RESOLVED[futures[future]]['name']}: {e}")
+    finally:
+        # The executor has waited for every worker by now. Apps already patched
+        # must be signed even if another one raised, or they are left unsigned.
+        results = {app_path: future.result() for future, app_path in futures.items()
+                   if future.done() and not future.cancelled() and future.exception() is None}
+        finish_apps(results, args.full_resign)
     print("Setup complete. For 'patch' apps, launch normally. For 'script' apps, use '~/Applications/<App Name> OpenGL.app' or '<app_name>_opengl.sh'.")
 
 if __name__ == "__main__":